@@ -1,3 +1,3 @@
-from .simpledbf import Dbf5
+from .simpledbf import Dbf5, Dbf5Writer
 
-__all__ = ['Dbf5',]
+__all__ = ['Dbf5', 'Dbf5Writer',]
@@ -2,21 +2,51 @@ import struct
 import datetime
 import os
 import codecs
+import importlib
+import decimal
+import itertools
+import math
+import numbers
+
+# Optional dependencies are not imported here. Pandas, PyTables, and
+# SQLalchemy are slow to import, so they are loaded by `_optional_import` the
+# first time an output method that needs them is called.
+optional_deps = {
+        'numpy': 'NumPy',
+        'pandas': 'Pandas',
+        'tables': 'PyTables',
+        'sqlalchemy': 'SQLalchemy',
+        }
 
-# Check for optional dependencies.
-try:
-    import pandas as pd
-except:
-    print("Pandas is not installed. No support for DataFrames, HDF, or SQL.")
-else:
-    try:
-        import tables as tb
-    except:
-        print("PyTables is not installed. No support for HDF output.")
+def _optional_import(module, feature):
+    '''Import an optional dependency on first use.
+
+    Parameters
+    ----------
+    module : string
+        The module name to import, e.g. 'pandas'.
+
+    feature : string
+        A short description of the output that requires this module. This is
+        only used in the error message.
+
+    Returns
+    -------
+    module
+        The imported module. Python caches imports, so calling this function
+        more than once is cheap.
+
+    Raises
+    ------
+    ImportError
+        If the module is not installed.
+    '''
     try:
-        import sqlalchemy as sql
-    except:
-        print("SQLalchemy is not installed. No support for SQL output.")
+        return importlib.import_module(module)
+    except ImportError:
+        err = '{} is not installed. It is required for {}.'
+        raise ImportError(err.format(optional_deps.get(module, module), 
+            feature))
 
 sqltypes = {
         'sqlite': {'str':'TEXT', 'float':'REAL', 'int': 'INTEGER', 
@@ -310,6 +340,7 @@ class DbfBase(object):
         -----
         This method requires Pandas >= 0.15.2.
         '''
+        pd = _optional_import('pandas', 'DataFrame output')
         self._na_set(na)
         if not chunksize:
             # _get_recs is a generator, convert to list for DataFrame
@@ -326,6 +357,7 @@ class DbfBase(object):
 
         See `to_dataframe`.
         '''
+        pd = _optional_import('pandas', 'DataFrame output')
         chunks = self._chunker(chunksize)
         # Keep track of the index, otherwise every DataFrame will be indexed
         # starting at 0
@@ -372,6 +404,8 @@ class DbfBase(object):
         -----
         This method requires Pandas >= 0.15.2 and SQLalchemy >= 0.9.7.
         '''
+        _optional_import('pandas', 'SQL output')
+        sql = _optional_import('sqlalchemy', 'SQL output')
         self._na_set(na)
         if not table:
             table = self.dbf[:-4] # strip trailing ".dbf"
@@ -405,7 +439,8 @@ class DbfBase(object):
 
         
     def to_pandashdf(self, h5name, table=None, chunksize=None, na='nan', 
-            complevel=9, complib='blosc', data_columns=None):
+            complevel=9, complib='blosc', data_columns=None, fsync='close',
+            index_after=False):
         '''Write DBF contents to an HDF5 file using Pandas.
 
         Parameters
@@ -449,6 +484,18 @@ class DbfBase(object):
             method, so for large numbers of columns, it is not recomended. See
             the Pandas IO documentation for more information.
 
+        fsync : None, 'close', or int, optional
+            How often the HDF file is synced to disk. If 'close' (default),
+            the file is synced once after all records are written. If an int
+            is given, the file is also synced after every `fsync` chunks. If
+            None, the file is never explicitly synced, which is fastest but
+            least durable.
+
+        index_after : bool, optional
+            If False (default), PyTables updates the table indexes as each
+            chunk is appended. If True, the indexes are built once after all
+            records are written, which is usually faster for large files.
+
         Notes
         -----
         This method requires Pandas >= 0.15.2 and PyTables >= 3.1.1.
@@ -457,34 +504,56 @@ class DbfBase(object):
         compression library (compression level = 9). This shouldn't affect
         performance much, but it does save an enormous amount of disk space.
         '''
+        pd = _optional_import('pandas', 'HDF output')
+        _optional_import('tables', 'HDF output')
         self._na_set(na)
         if not table:
             table = self.dbf[:-4] # strip trailing ".dbf"
 
-        h5 = pd.HDFStore(h5name, 'a', complevel=complevel, complib=complib)
+        if isinstance(fsync, bool) or not (fsync in (None, 'close') or 
+                (isinstance(fsync, int) and fsync > 0)):
+            err = "The fsync argument must be None, 'close', or an int > 0."
+            raise ValueError(err)
+
+        # Set the width of each string column from the DBF header. This is
+        # necessary because the appendable table can not change width if a
+        # new DF is added with a longer string. Pandas stores columns with a
+        # min_itemsize as separate data columns, so each string column only
+        # takes up its own width.
+        itemsize = {}
+        for name, typ, size in self.fields[1:]:
+            if typ == "C":
+                itemsize[name] = size
+
+        # The string columns are data columns now, so explicitly set the
+        # indexed columns. This is the same set PyTables would have indexed
+        # for the given `data_columns`
+        if data_columns is True:
+            index = True
+        else:
+            index = ['index',] + list(data_columns or [])
 
         if not chunksize:
-            df = self.to_dataframe()
-            h5.append(table, df, data_columns=data_columns)
+            dfs = [self.to_dataframe(),]
         else:
-            # Find the maximum string column length This is necessary because
-            # the appendable table can not change width if a new DF is added
-            # with a longer string
-            max_string_len = {}
-            mx = 0
-            for field in self.fields:
-                if field[1] == "C" and field[2] > mx:
-                    mx = field[2]
-            if mx != 0:
-                max_string_len = {'values':mx}
+            dfs = self.to_dataframe(chunksize=chunksize)
 
-            for df in self.to_dataframe(chunksize=chunksize):
-                h5.append(table, df, min_itemsize=max_string_len,
-                        data_columns=data_columns)
+        h5 = pd.HDFStore(h5name, 'a', complevel=complevel, complib=complib)
+        try:
+            for n, df in enumerate(dfs, 1):
+                h5.append(table, df, min_itemsize=itemsize, 
+                        data_columns=data_columns, expectedrows=self.numrec,
+                        index=(not index_after) and index)
+                if fsync not in (None, 'close') and n % fsync == 0:
+                    h5.flush(fsync=True)
+                del(df)
+
+            if index_after:
+                h5.create_table_index(table, columns=index)
+            if fsync is not None:
                 h5.flush(fsync=True)
-        
-        del(df)
-        h5.close()
+        finally:
+            h5.close()
 
 class Dbf5(DbfBase):
     '''
@@ -669,4 +738,649 @@ class Dbf5(DbfBase):
 
                 result.append(value)
             yield result
-    
+
+
+def _is_missing(value):
+    '''Return True for None and NaN-like values (NaN, NaT, Pandas NA).'''
+    if value is None:
+        return True
+    try:
+        return bool(value != value)
+    except TypeError:
+        # Pandas NA can not be converted to a bool
+        return True
+
+
+def _to_python(value):
+    '''Convert NumPy scalars to the equivalent Python objects.
+
+    Datetimes are converted to dates, otherwise NumPy returns an int for
+    nanosecond datetimes.
+    '''
+    if hasattr(value, 'dtype') and hasattr(value, 'item'):
+        if value.dtype.kind == 'M':
+            value = value.astype('datetime64[D]')
+        return value.item()
+    return value
+
+
+def _column_list(col):
+    '''Convert a column sequence or array to a list of Python objects.'''
+    if getattr(col, 'dtype', None) is not None and col.dtype.kind == 'M':
+        col = col.astype('datetime64[D]')
+    if hasattr(col, 'tolist'):
+        return col.tolist()
+    return [_to_python(v) for v in col]
+
+
+def _float_str(value, decimals=None):
+    '''Format a number for a 'N' or 'F' field.
+
+    If `decimals` is None, the shortest positional (not exponential) string
+    that round-trips to the same float is used. The result always contains a
+    decimal point, which is how the reader tells floats from ints in 'N'
+    fields.
+
+    Raises
+    ------
+    ValueError
+        If the value is infinite, which DBF files can not store.
+    '''
+    if math.isinf(value):
+        err = 'Infinite value {!r} can not be written to a DBF file.'
+        raise ValueError(err.format(value))
+    if decimals is not None:
+        return '{:.{}f}'.format(value, decimals)
+    return _positional(repr(float(value)))
+
+
+def _positional(out):
+    '''Convert a shortest float repr string to positional notation.'''
+    if 'e' in out:
+        out = format(decimal.Decimal(out), 'f')
+    if '.' not in out:
+        out += '.0'
+    return out
+
+
+def _num_decimals(out):
+    '''Return the number of decimal places in a formatted number.'''
+    if '.' not in out:
+        return 0
+    return len(out) - out.index('.') - 1
+
+
+def _shortest_floats(np, values):
+    '''Vectorized `_float_str` for an array of finite floats.
+
+    NumPy gives the same shortest round-trip strings as `repr`, so only values
+    in exponential notation need fixing.
+    '''
+    out = values.astype('U')
+    expo = np.char.find(out, 'e') >= 0
+    if expo.any():
+        out = out.astype(object)
+        out[expo] = [_positional(v) for v in out[expo]]
+        out = out.astype('U')
+    return out.astype('S')
+
+
+def _infer_field(name, values, codec):
+    '''Infer a (name, type, size) field spec from column values.
+
+    Parameters
+    ----------
+    name : string
+        The column name.
+
+    values : list
+        The column values. Missing values (None/NaN/NaT/NA) are ignored.
+
+    codec : string
+        The codec used to encode 'C' values, needed for the byte width.
+    '''
+    present = [_to_python(v) for v in values if not _is_missing(v)]
+    if not present:
+        return (name, 'C', 1)
+
+    if all(isinstance(v, bool) for v in present):
+        return (name, 'L', 1)
+    elif all(isinstance(v, numbers.Integral) and not isinstance(v, bool) 
+            for v in present):
+        size = max(len(str(int(v))) for v in present)
+        return (name, 'N', size)
+    elif all(isinstance(v, numbers.Real) and not isinstance(v, bool) 
+            for v in present):
+        size = max(len(_float_str(v)) for v in present)
+        return (name, 'F', size)
+    elif all(hasattr(v, 'year') and hasattr(v, 'month') and hasattr(v, 'day')
+            for v in present):
+        return (name, 'D', 8)
+    else:
+        size = max(len(_to_bytes(v, codec)) for v in present)
+        return (name, 'C', size)
+
+
+def _to_bytes(value, codec):
+    '''Encode a value for a 'C' field.'''
+    if isinstance(value, bytes):
+        return value
+    return u'{}'.format(value).encode(codec)
+
+
+class Dbf5Writer(object):
+    '''
+    DBF version 5 file writing object.
+
+    This class writes a DataFrame, a dictionary of column arrays, or an
+    iterable of records to a version 5 DBF file that can be read back with
+    `Dbf5`. Records are written to the file in large blocks, one block per
+    chunk; DataFrame columns are formatted with vectorized NumPy/Pandas
+    operations, which requires Pandas >= 1.0. The file header is updated with
+    the final record count when the writer is closed, so `write` can be
+    called as many times as necessary to stream data that does not fit in
+    RAM.
+
+    Parameters
+    ----------
+
+    dbf : string
+        The name (with optional path) of the DBF file. An existing file will
+        be overwritten.
+
+    fields : list of tuples, optional
+        Column descriptions as tuples: (Name, Type, # of bytes). This is the
+        same format as `Dbf5.fields`, so the fields of an input file can be
+        passed directly; the "DeletionFlag" column is ignored. An optional
+        fourth value sets the number of decimal places for 'N' and 'F'
+        columns. If 'None' (default), the fields are inferred from the data
+        passed to the first `write` call.
+
+    codec : string, optional
+        The codec to use when encoding text-based records. The default is
+        'utf-8'.
+
+    chunksize : int, optional
+        The number of records to format and write to the file as a single
+        block. Default is 10000.
+
+    Attributes
+    ----------
+
+    dbf : string
+        The output file name.
+
+    f : file object
+        The opened DBF file object
+
+    numrec : int
+        The number of records written so far.
+
+    fields : list of tuples
+        Column descriptions as a tuple: (Name, Type, # of bytes). Set on the
+        first call to `write` if not given.
+
+    columns : list
+        The names of the data columns.
+
+    fmtsiz : int
+        The size of each record in bytes.
+
+    Notes
+    -----
+    Only 'C', 'N', 'F', 'D', and 'L' columns are supported. Values that do not
+    fit in their column width raise a ValueError rather than being truncated,
+    as do infinite floats and records with the wrong number of values.
+    Missing values (None/NaN/NaT/NA) are written as blanks ('?' for 'L'),
+    which `Dbf5` reads back as missing. Leading and trailing white space in
+    strings is not preserved, because `Dbf5` strips it.
+
+    Floats in 'N'/'F' columns without a given number of decimal places are
+    written with the shortest string that round-trips exactly. The decimal
+    count in the header is set to the largest number of decimal places
+    written when the file is closed.
+    '''
+    def __init__(self, dbf, fields=None, codec='utf-8', chunksize=10000):
+        self._enc = codec
+        self._chunksize = chunksize
+        path, name = os.path.split(dbf)
+        self.dbf = name
+        self.numrec = 0
+        self.fields = None
+        self.columns = None
+        # Validate the fields before creating the file
+        if fields is not None:
+            self._set_fields(fields)
+        self.f = open(dbf, 'wb')
+        if fields is not None:
+            self._write_header()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _set_fields(self, fields):
+        '''Validate the field specs.
+
+        Parameters
+        ----------
+        fields : list of tuples
+            (Name, Type, # of bytes[, decimals]) tuples. See the class
+            docstring.
+        '''
+        specs = []
+        for field in fields:
+            if field[0] == 'DeletionFlag':
+                continue
+            name, typ, size = field[:3]
+            if len(field) > 3:
+                decimals = field[3]
+            else:
+                decimals = None
+            if typ not in 'CNFDL' or len(typ) != 1:
+                err = 'Column type "{}" not yet supported.'
+                raise ValueError(err.format(typ))
+            if typ == 'D':
+                size = 8
+            elif typ == 'L':
+                size = 1
+            if not 0 < size < 256:
+                err = 'Column "{}" size must be between 1 and 255 bytes.'
+                raise ValueError(err.format(name))
+            if len(name.encode(self._enc)) > 10:
+                err = 'Column name "{}" is longer than 10 bytes.'
+                raise ValueError(err.format(name))
+            specs.append((name, typ, size, decimals))
+
+        fmtsiz = 1 + sum(spec[2] for spec in specs)
+        if fmtsiz > 0xFFFF:
+            raise ValueError('Record length exceeds 65535 bytes.')
+
+        self._specs = specs
+        self.fields = [('DeletionFlag', 'C', 1),] + \
+                      [spec[:3] for spec in specs]
+        self.columns = [spec[0] for spec in specs]
+        self.fmtsiz = fmtsiz
+        # Largest number of decimal places written to each column. Only used
+        # for 'N'/'F' columns without a given number of decimals.
+        self._decimals = [0,]*len(specs)
+        self._formatters = [self._formatter(n, *spec) for n, spec in 
+                            enumerate(specs)]
+
+    def _write_header(self):
+        '''Write the file header and field descriptors.'''
+        today = datetime.date.today()
+        lenheader = 32*(len(self._specs) + 1) + 1
+        self.f.write(struct.pack('<4BLHH20x', 3, today.year - 1900, 
+                today.month, today.day, self.numrec, lenheader, self.fmtsiz))
+        for name, typ, size, decimals in self._specs:
+            self.f.write(struct.pack('<11sc4xBB14x', name.encode(self._enc),
+                typ.encode('ascii'), size, decimals or 0))
+        self.f.write(b'\r')
+
+    def _formatter(self, idx, name, typ, size, decimals):
+        '''Return a function that converts a value to a fixed-width field.
+
+        Parameters
+        ----------
+        idx : int
+            The column number.
+
+        name, typ, size, decimals
+            A single field spec. See `_set_fields`.
+        '''
+        enc = self._enc
+        blank = b' '*size
+        seen = self._decimals
+
+        def check(out, value):
+            if len(out) > size:
+                err = 'Value {!r} does not fit in column "{}" ({:d} bytes).'
+                raise ValueError(err.format(value, name, size))
+            return out
+
+        if typ == 'C':
+            def fmt(value):
+                if _is_missing(value):
+                    return blank
+                value = _to_python(value)
+                return check(_to_bytes(value, enc), value).ljust(size)
+        elif typ in 'NF':
+            def fmt(value):
+                if _is_missing(value):
+                    return blank
+                value = _to_python(value)
+                # Whole numbers in 'N' columns are written as ints
+                if typ == 'N' and isinstance(value, numbers.Integral) \
+                        and not isinstance(value, bool):
+                    out = str(int(value))
+                else:
+                    out = _float_str(value, decimals)
+                    if decimals is None:
+                        seen[idx] = max(seen[idx], _num_decimals(out))
+                return check(out.encode('ascii'), value).rjust(size)
+        elif typ == 'D':
+            def fmt(value):
+                if _is_missing(value):
+                    return blank
+                value = _to_python(value)
+                if hasattr(value, 'year'):
+                    out = '{:04d}{:02d}{:02d}'.format(value.year, 
+                            value.month, value.day)
+                else:
+                    out = u'{}'.format(value)
+                return check(out.encode('ascii'), value).ljust(size)
+        elif typ == 'L':
+            def fmt(value):
+                if _is_missing(value):
+                    return b'?'
+                value = _to_python(value)
+                if isinstance(value, bool):
+                    return b'T' if value else b'F'
+                # The same characters that `Dbf5` accepts
+                if isinstance(value, bytes):
+                    value = value.decode('ascii', 'replace')
+                if isinstance(value, type(u'')) and len(value) == 1 and \
+                        value in 'TtYyFfNn?':
+                    return value.encode('ascii')
+                err = 'Value {!r} is not a valid logical for column "{}".'
+                raise ValueError(err.format(value, name))
+        return fmt
+
+    def _format_series(self, np, idx, series):
+        '''Format a DataFrame column with vectorized operations.
+
+        Parameters
+        ----------
+        np : module
+            NumPy, which is always available with Pandas.
+
+        idx : int
+            The column number.
+
+        series : Series
+            The column values.
+
+        Returns
+        -------
+        ndarray
+            Fixed-width byte strings, or None if the column dtype is not
+            supported here. Those columns are formatted one value at a time.
+        '''
+        name, typ, size, decimals = self._specs[idx]
+        kind = series.dtype.kind
+        mask = series.isna().to_numpy()
+        present = ~mask
+
+        if typ == 'C' and kind in 'OUT':
+            values = series.to_numpy(dtype=object, na_value='')
+            # Bytes and non-string objects are left to `_formatter`
+            if not all(isinstance(v, str) for v in values):
+                return None
+            out = np.array([v.encode(self._enc) for v in values], dtype='S')
+            justify = np.char.ljust
+        elif typ == 'N' and kind in 'iu':
+            out = series.to_numpy(dtype='int64', na_value=0).astype('S')
+            justify = np.char.rjust
+        elif typ in 'NF' and kind in 'iuf':
+            values = series.to_numpy(dtype='float64', na_value=0.)
+            if np.isinf(values[present]).any():
+                err = 'Infinite values can not be written to column "{}".'
+                raise ValueError(err.format(name))
+            if decimals is not None:
+                fmt = '%.{:d}f'.format(decimals)
+                out = np.char.mod(fmt, values).astype('S')
+            else:
+                out = _shortest_floats(np, values)
+                if present.any():
+                    places = np.char.str_len(out) - np.char.find(out, b'.') - 1
+                    self._decimals[idx] = max(self._decimals[idx], 
+                                              int(places[present].max()))
+            justify = np.char.rjust
+        elif typ == 'D' and kind == 'M':
+            # Build YYYYMMDD as an int, which is much faster than strftime
+            dates = series.dt
+            out = (dates.year*10000 + dates.month*100 + dates.day)
+            out = out.to_numpy(dtype='int64', na_value=0).astype('S')
+            out = np.char.zfill(out, 8)
+            justify = np.char.ljust
+        elif typ == 'L' and kind == 'b':
+            values = series.to_numpy(dtype=bool, na_value=False)
+            out = np.where(values, b'T', b'F')
+            out[mask] = b'?'
+            return out
+        else:
+            return None
+
+        if len(out) and np.char.str_len(out).max() > size:
+            bad = int(np.argmax(np.char.str_len(out) > size))
+            err = 'Value {!r} does not fit in column "{}" ({:d} bytes).'
+            raise ValueError(err.format(series.iloc[bad], name, size))
+        out = justify(out, size)
+        out[mask] = b' '*size
+        return out
+
+    def _infer_frame(self, data):
+        '''Set the fields from a DataFrame, and write the header.
+
+        Columns with common dtypes are inferred with vectorized operations;
+        others are passed to `_infer_field`.
+        '''
+        np = _optional_import('numpy', 'DataFrame input')
+        fields = []
+        for label in data.columns:
+            name = str(label)
+            series = data[label]
+            kind = series.dtype.kind
+            present = ~series.isna().to_numpy()
+            if not present.any():
+                fields.append((name, 'C', 1))
+            elif kind == 'b':
+                fields.append((name, 'L', 1))
+            elif kind in 'iu':
+                values = series.to_numpy(dtype='int64', na_value=0)[present]
+                size = int(np.char.str_len(values.astype('S')).max())
+                fields.append((name, 'N', size))
+            elif kind == 'f':
+                values = series.to_numpy(dtype='float64', na_value=0.)
+                values = values[present]
+                if np.isinf(values).any():
+                    err = 'Infinite values can not be written to column "{}".'
+                    raise ValueError(err.format(name))
+                out = _shortest_floats(np, values)
+                fields.append((name, 'F', int(np.char.str_len(out).max())))
+            elif kind == 'M':
+                fields.append((name, 'D', 8))
+            elif kind in 'OUT' and all(isinstance(v, str) for v in 
+                    series.to_numpy(dtype=object)[present]):
+                values = series.to_numpy(dtype=object)[present]
+                out = np.array([v.encode(self._enc) for v in values], 
+                               dtype='S')
+                fields.append((name, 'C', int(np.char.str_len(out).max())))
+            else:
+                fields.append(_infer_field(name, series.tolist(), self._enc))
+        self._set_fields(fields)
+        self._write_header()
+
+    def _write_frame(self, chunk, labels):
+        '''Format a DataFrame chunk and write it as a single block.
+
+        Parameters
+        ----------
+        chunk : DataFrame
+            The records to write.
+
+        labels : list
+            The DataFrame column labels in field order.
+        '''
+        np = _optional_import('numpy', 'DataFrame input')
+        num = len(chunk)
+        # One row of bytes per record, starting with the deletion flag
+        block = np.full((num, self.fmtsiz), ord(' '), dtype=np.uint8)
+        start = 1
+        for idx, label in enumerate(labels):
+            size = self._specs[idx][2]
+            series = chunk[label]
+            out = self._format_series(np, idx, series)
+            if out is None:
+                fmt = self._formatters[idx]
+                out = np.array([fmt(v) for v in series.tolist()], 
+                               dtype='S{:d}'.format(size))
+            out = out.astype('S{:d}'.format(size))
+            block[:, start:start+size] = out.view(np.uint8).reshape(num, size)
+            start += size
+        self.f.write(block.tobytes())
+        self.numrec += num
+
+    def _chunks(self, data, chunksize):
+        '''Generator that splits dictionary or record input into column
+        chunks.
+
+        Yields
+        ------
+        list of lists
+            One list of values for each column, all with the same length.
+        '''
+        # Dictionary of column arrays
+        if isinstance(data, dict):
+            columns = self.columns or list(data.keys())
+            lengths = set(len(data[c]) for c in columns)
+            if len(lengths) > 1:
+                raise ValueError('All columns must have the same length.')
+            if self.fields is None:
+                self._infer_fields(columns, 
+                                   [_column_list(data[c]) for c in columns])
+            length = lengths.pop() if lengths else 0
+            for start in range(0, length, chunksize):
+                yield [_column_list(data[c][start:start+chunksize]) for c in
+                       columns]
+        # Iterable of records
+        else:
+            # Sequences can be inferred from all of the records; iterators
+            # only from the first chunk
+            if self.fields is None and hasattr(data, '__len__') and \
+                    len(data) > 0:
+                numcols = len(next(iter(data)))
+                self._check_records(data, numcols)
+                self._infer_fields(['col_{:d}'.format(n) for n in 
+                                    range(numcols)], 
+                                   [list(c) for c in zip(*data)])
+            records = iter(data)
+            while True:
+                chunk = list(itertools.islice(records, chunksize))
+                if not chunk:
+                    break
+                if self.columns is not None:
+                    numcols = len(self.columns)
+                else:
+                    numcols = len(chunk[0])
+                self._check_records(chunk, numcols)
+                cols = [list(c) for c in zip(*chunk)]
+                if self.fields is None:
+                    self._infer_fields(['col_{:d}'.format(n) for n in 
+                                        range(numcols)], cols)
+                yield cols
+
+    def _check_records(self, records, numcols):
+        '''Raise a ValueError if any record does not have `numcols` values.
+        '''
+        for record in records:
+            if len(record) != numcols:
+                err = 'Record {!r} does not have {:d} values.'
+                raise ValueError(err.format(record, numcols))
+
+    def _infer_fields(self, columns, cols):
+        '''Set the fields from column names and values, and write the
+        header. See `_infer_field`.
+        '''
+        self._set_fields([_infer_field(str(name), col, self._enc) 
+                          for name, col in zip(columns, cols)])
+        self._write_header()
+
+    def write(self, data, chunksize=None):
+        '''Write records to the DBF file.
+
+        Parameters
+        ----------
+        data : DataFrame, dict, or iterable
+            The records to write. This can be a DataFrame, a dictionary of
+            column name -> sequence of values, or an iterable (e.g.
+            generator) of records, each a sequence of values in column order.
+            DataFrame and dictionary columns are selected by the field names;
+            the DataFrame index is not written. Dictionaries are converted to
+            a DataFrame if Pandas is installed.
+
+        chunksize : int, optional
+            The number of records formatted and written as a single block. If
+            'None' (default), the value given when creating the writer is
+            used.
+
+        Notes
+        -----
+        If the fields were not given when creating the writer, they are
+        inferred from the data in the first `write` call. For an iterator of
+        records, only the first chunk is used, so later values that are wider
+        than the first chunk raise a ValueError. Pass `fields` when streaming
+        data.
+
+        Writing DataFrames requires Pandas >= 1.0.
+        '''
+        if not chunksize:
+            chunksize = self._chunksize
+
+        # Dictionaries of columns use the vectorized DataFrame path if Pandas
+        # is available. Columns that are not arrays keep their Python objects.
+        if isinstance(data, dict):
+            try:
+                pd = _optional_import('pandas', 'DataFrame input')
+            except ImportError:
+                pass
+            else:
+                columns = self.columns or list(data.keys())
+                if len(set(len(data[c]) for c in columns)) > 1:
+                    raise ValueError('All columns must have the same length.')
+                data = pd.DataFrame(dict((c, pd.Series(data[c], 
+                    dtype=None if hasattr(data[c], 'dtype') else object))
+                    for c in columns), columns=columns)
+
+        # DataFrame
+        if hasattr(data, 'columns') and hasattr(data, 'iloc'):
+            # Field names are strings, but the labels may not be
+            labels = dict((str(c), c) for c in data.columns)
+            if self.fields is None:
+                self._infer_frame(data)
+            labels = [labels.get(name, name) for name in self.columns]
+            for start in range(0, len(data), chunksize):
+                self._write_frame(data.iloc[start:start+chunksize], labels)
+            return
+
+        for cols in self._chunks(data, chunksize):
+            num = len(cols[0]) if cols else 0
+            # Format each column as a whole, then stitch together the records
+            # and write the entire chunk as a single block
+            formatted = [[fmt(v) for v in col] for fmt, col in 
+                         zip(self._formatters, cols)]
+            flags = [b' ',]*num
+            self.f.write(b''.join(b''.join(rec) for rec in 
+                                  zip(flags, *formatted)))
+            self.numrec += num
+
+    def close(self):
+        '''Write the final record count, decimal counts, and end-of-file
+        marker, and close the file.'''
+        if self.f.closed:
+            return
+        if self.fields is None:
+            self._set_fields([])
+            self._write_header()
+        self.f.write(b'\x1a')
+        self.f.seek(4)
+        self.f.write(struct.pack('<L', self.numrec))
+        for n, (name, typ, size, decimals) in enumerate(self._specs):
+            if typ in 'NF' and decimals is None:
+                # Decimal count byte of the field descriptor
+                self.f.seek(32*(n + 1) + 17)
+                self.f.write(struct.pack('<B', self._decimals[n]))
+        self.f.close()
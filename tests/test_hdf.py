@@ -0,0 +1,46 @@
+import pytest
+
+from simpledbf import Dbf5, Dbf5Writer
+
+pd = pytest.importorskip('pandas')
+tables = pytest.importorskip('tables')
+
+def _make_dbf(dbfname, numrec=25):
+    fields = [('name', 'C', 20), ('code', 'C', 3), ('n', 'N', 5)]
+    with Dbf5Writer(dbfname, fields=fields) as dbf:
+        dbf.write([[u'abc', u'x', i] for i in range(numrec)])
+
+def _open_files():
+    return tables.file._open_files.filenames
+
+@pytest.mark.parametrize('kwargs', [
+    {},
+    {'chunksize': 10, 'fsync': 2},
+    {'chunksize': 10, 'fsync': None, 'index_after': True},
+    ])
+def test_to_pandashdf(tmpdir, kwargs):
+    dbfname = str(tmpdir.join('in.dbf'))
+    h5name = str(tmpdir.join('out.h5'))
+    _make_dbf(dbfname)
+    dbf = Dbf5(dbfname)
+    dbf.to_pandashdf(h5name, table='t', **kwargs)
+    dbf.f.close()
+    assert h5name not in _open_files()
+
+    with pd.HDFStore(h5name, 'r') as h5:
+        assert len(h5['t']) == 25
+        description = h5.get_storer('t').table.description
+        assert description.name.itemsize == 20
+        assert description.code.itemsize == 3
+        assert list(h5.get_storer('t').table.colindexes) == ['index']
+
+@pytest.mark.parametrize('fsync', [True, False, 0, -1, 'always'])
+def test_to_pandashdf_bad_fsync(tmpdir, fsync):
+    dbfname = str(tmpdir.join('in.dbf'))
+    h5name = str(tmpdir.join('out.h5'))
+    _make_dbf(dbfname)
+    dbf = Dbf5(dbfname)
+    with pytest.raises(ValueError):
+        dbf.to_pandashdf(h5name, fsync=fsync)
+    dbf.f.close()
+    assert h5name not in _open_files()
@@ -0,0 +1,33 @@
+import os
+import subprocess
+import sys
+
+# Importing simpledbf should only load the standard library. Pandas alone
+# takes well over this to import, so a regression to eager optional imports
+# will blow this budget.
+IMPORT_BUDGET_US = 100000
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def _run(code, *args):
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join([ROOT, env.get('PYTHONPATH', '')])
+    return subprocess.run([sys.executable] + list(args) + ['-c', code],
+            env=env, stdout=subprocess.PIPE, stderr=subprocess.PIPE, 
+            universal_newlines=True, check=True)
+
+def test_import_time_budget():
+    out = _run('import simpledbf', '-X', 'importtime')
+    # The last line of the import time report is the top-level package:
+    # "import time: self [us] | cumulative | imported package"
+    last = [l for l in out.stderr.splitlines() if l.endswith('| simpledbf')]
+    cumulative = int(last[-1].split('|')[1])
+    assert cumulative < IMPORT_BUDGET_US
+
+def test_optional_deps_not_imported():
+    code = ('import sys, simpledbf\n'
+            'print(",".join(m for m in ("pandas", "tables", "sqlalchemy") '
+            'if m in sys.modules))')
+    out = _run(code)
+    assert out.stdout.strip() == ''
+    assert out.stderr == ''
@@ -0,0 +1,204 @@
+import datetime
+import math
+import os
+import struct
+
+import pytest
+
+from simpledbf import Dbf5, Dbf5Writer
+
+FIELDS = [('name', 'C', 12), ('count', 'N', 6), ('ratio', 'F', 24),
+          ('day', 'D', 8), ('flag', 'L', 1)]
+
+RECORDS = [
+    [u'abc', 1, 0.1, datetime.date(2020, 1, 2), True],
+    [u'b\xe9', -20, 1e20, None, False],
+    [None, 300, float('nan'), datetime.date(1999, 12, 31), True],
+    [u'long string', None, -3.14159265358979, datetime.date(2001, 1, 1), 
+     None],
+    ]
+
+def _read(dbfname):
+    '''Read all records with missing values as None.'''
+    dbf = Dbf5(dbfname)
+    dbf._na_set('none')
+    records = list(dbf._get_recs())
+    dbf.f.close()
+    return records
+
+def _fields(dbfname):
+    '''Return the fields of a DBF file.'''
+    dbf = Dbf5(dbfname)
+    dbf.f.close()
+    return dbf.fields
+
+def _same(a, b):
+    '''Compare values, treating all missing values as equal.'''
+    missing = lambda v: v is None or (isinstance(v, float) and math.isnan(v))
+    if missing(a) or missing(b):
+        return missing(a) and missing(b)
+    return a == b and type(a) == type(b)
+
+def _check(dbfname, records):
+    result = _read(dbfname)
+    assert len(result) == len(records)
+    for out, rec in zip(result, records):
+        for a, b in zip(out, rec):
+            assert _same(a, b), (a, b)
+
+def _decimals(dbfname):
+    '''Return the header decimal count of each field.'''
+    with open(dbfname, 'rb') as f:
+        numrec, lenheader = struct.unpack('<xxxxLH22x', f.read(32))
+        return [struct.unpack('<16xBB14x', f.read(32))[1] for n in 
+                range((lenheader - 33)//32)]
+
+def test_records_roundtrip(tmpdir):
+    dbfname = str(tmpdir.join('out.dbf'))
+    with Dbf5Writer(dbfname, fields=FIELDS, chunksize=3) as dbf:
+        dbf.write(iter(RECORDS))
+    _check(dbfname, RECORDS)
+    assert _fields(dbfname)[1:] == FIELDS
+    assert _decimals(dbfname) == [0, 0, 14, 0, 0]
+
+def test_inferred_fields_roundtrip(tmpdir):
+    dbfname = str(tmpdir.join('out.dbf'))
+    with Dbf5Writer(dbfname) as dbf:
+        dbf.write(RECORDS)
+    _check(dbfname, RECORDS)
+    assert [f[1] for f in _fields(dbfname)[1:]] == list('CNFDL')
+
+def test_dict_roundtrip(tmpdir):
+    dbfname = str(tmpdir.join('out.dbf'))
+    columns = dict((f[0], [r[n] for r in RECORDS]) for n, f in 
+                   enumerate(FIELDS))
+    with Dbf5Writer(dbfname, fields=FIELDS) as dbf:
+        dbf.write(columns)
+    _check(dbfname, RECORDS)
+
+def test_copy_keeps_decimals(tmpdir):
+    src = str(tmpdir.join('src.dbf'))
+    copy = str(tmpdir.join('copy.dbf'))
+    with Dbf5Writer(src, fields=[('x', 'N', 8, 3)]) as dbf:
+        dbf.write([[1.5], [2.25]])
+    assert _decimals(src) == [3]
+    # Fields from the reader do not have decimals, so they are set from the
+    # values written
+    with Dbf5Writer(copy, fields=_fields(src)) as dbf:
+        dbf.write(_read(src))
+    assert _read(copy) == [[1.5], [2.25]]
+    assert _decimals(copy) == [2]
+
+def test_ragged_records(tmpdir):
+    dbfname = str(tmpdir.join('out.dbf'))
+    with Dbf5Writer(dbfname, fields=[('a', 'N', 3), ('b', 'C', 3)]) as dbf:
+        with pytest.raises(ValueError):
+            dbf.write([[1, 'x'], [2]])
+        with pytest.raises(ValueError):
+            dbf.write([[1, 'x', 'y']])
+        with pytest.raises(ValueError):
+            dbf.write({'a': [1, 2, 3], 'b': ['x']})
+
+def test_bad_values(tmpdir):
+    dbfname = str(tmpdir.join('out.dbf'))
+    with Dbf5Writer(dbfname) as dbf:
+        with pytest.raises(ValueError):
+            dbf.write([[float('inf')]])
+    with Dbf5Writer(dbfname, fields=[('a', 'C', 2)]) as dbf:
+        with pytest.raises(ValueError):
+            dbf.write([['abc']])
+
+def test_logicals(tmpdir):
+    dbfname = str(tmpdir.join('out.dbf'))
+    with Dbf5Writer(dbfname, fields=[('a', 'L', 1)]) as dbf:
+        dbf.write([[True], ['F'], ['y'], ['N'], ['?']])
+        with pytest.raises(ValueError):
+            dbf.write([['False']])
+        with pytest.raises(ValueError):
+            dbf.write([[1]])
+    assert _read(dbfname) == [[True], [False], [True], [False], [None]]
+
+def test_inferred_from_all_records(tmpdir):
+    dbfname = str(tmpdir.join('out.dbf'))
+    records = [[u'a'],]*10 + [[u'longer']]
+    with Dbf5Writer(dbfname, chunksize=3) as dbf:
+        dbf.write(records)
+    assert _fields(dbfname)[1:] == [('col_0', 'C', 6)]
+    _check(dbfname, records)
+
+def test_invalid_fields_no_file(tmpdir):
+    dbfname = str(tmpdir.join('out.dbf'))
+    with pytest.raises(ValueError):
+        Dbf5Writer(dbfname, fields=[('a', 'X', 3)])
+    assert not os.path.exists(dbfname)
+
+def test_dataframe_roundtrip(tmpdir):
+    pd = pytest.importorskip('pandas')
+    dbfname = str(tmpdir.join('out.dbf'))
+    df = pd.DataFrame(RECORDS, columns=[f[0] for f in FIELDS])
+    df['day'] = pd.to_datetime(df['day'])
+    df['count'] = df['count'].astype('Int64')
+    df['flag'] = df['flag'].astype('boolean')
+    df['name'] = df['name'].astype('string')
+    for fields in (FIELDS, None):
+        with Dbf5Writer(dbfname, fields=fields, chunksize=3) as dbf:
+            dbf.write(df)
+        _check(dbfname, RECORDS)
+    # Object columns are formatted one value at a time
+    with Dbf5Writer(dbfname, fields=FIELDS) as dbf:
+        dbf.write(df.astype(object))
+    _check(dbfname, RECORDS)
+
+def test_dataframe_int_labels(tmpdir):
+    pd = pytest.importorskip('pandas')
+    dbfname = str(tmpdir.join('out.dbf'))
+    with Dbf5Writer(dbfname) as dbf:
+        dbf.write(pd.DataFrame([[1, 2.5]]))
+        dbf.write(pd.DataFrame([[3, 4.0]]))
+    assert [f[0] for f in _fields(dbfname)[1:]] == ['0', '1']
+    assert _read(dbfname) == [[1, 2.5], [3, 4.0]]
+
+def test_dataframe_inf(tmpdir):
+    pd = pytest.importorskip('pandas')
+    dbfname = str(tmpdir.join('out.dbf'))
+    df = pd.DataFrame({'a': [1.0, float('inf')]})
+    with Dbf5Writer(dbfname) as dbf:
+        with pytest.raises(ValueError):
+            dbf.write(df)
+    with Dbf5Writer(dbfname, fields=[('a', 'F', 10)]) as dbf:
+        with pytest.raises(ValueError):
+            dbf.write(df)
+
+@pytest.mark.parametrize('use_pandas', [True, False])
+def test_numpy_dict_roundtrip(tmpdir, monkeypatch, use_pandas):
+    np = pytest.importorskip('numpy')
+    if use_pandas:
+        pytest.importorskip('pandas')
+    else:
+        # Without Pandas, dictionaries are formatted one value at a time
+        import simpledbf.simpledbf as sdbf
+        real_import = sdbf._optional_import
+        def no_pandas(module, feature):
+            if module == 'pandas':
+                raise ImportError(module)
+            return real_import(module, feature)
+        monkeypatch.setattr(sdbf, '_optional_import', no_pandas)
+
+    dbfname = str(tmpdir.join('out.dbf'))
+    columns = {
+        'b': np.array([True, False, True]),
+        'i': np.array([1, -20, 300]),
+        'f': np.array([0.1, float('nan'), -2.5]),
+        'd': np.array(['2020-01-02', 'NaT', '1999-12-31'], 
+                      dtype='datetime64[ns]'),
+        'dd': np.array(['2020-01-02', '2001-01-01', 'NaT'], 
+                       dtype='datetime64[D]'),
+        }
+    with Dbf5Writer(dbfname) as dbf:
+        dbf.write(columns)
+    assert [f[1] for f in _fields(dbfname)[1:]] == list('LNFDD')
+    _check(dbfname, [
+        [True, 1, 0.1, datetime.date(2020, 1, 2), datetime.date(2020, 1, 2)],
+        [False, -20, None, None, datetime.date(2001, 1, 1)],
+        [True, 300, -2.5, datetime.date(1999, 12, 31), None],
+        ])